@@ -38,174 +38,302 @@ Other Arguments
 """
 
 
-import argparse, html.parser, json, os, re, sys, urllib.parse, urllib.request
-import subprocess
-import re
+import argparse, asyncio, functools, gzip, hashlib, json, os, re, sys, urllib.parse
+
+import aiohttp
+
+try:
+    # optional: SIMD-accelerated parser, noticeably faster on Mealie's
+    # 100-recipe pages and large JSON-LD blobs
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+# How many recipe downloads / API calls to keep in flight at once.
+# The work is pure I/O, so concurrency collapses wall time to roughly
+# max(latency) instead of sum(latency) across hundreds of files.
+DOWNLOAD_CONCURRENCY = 20
+DELETE_CONCURRENCY   = 10
+
+# Page size for walking Mealie's recipe listing; larger pages mean 5x fewer
+# round-trips than the API's default-ish 100.
+LIST_PAGE_SIZE = 500
 
 # ---------- helpers ----------
-class IndexParser(html.parser.HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self.links = []
-    def handle_starttag(self, tag, attrs):
-        if tag == "a":
-            href = dict(attrs).get("href", "")
-            if href.lower().endswith(".html"):
-                self.links.append(href)
-
-def fetch_listing(index_url):
-    with urllib.request.urlopen(index_url) as r:
-        html = r.read().decode("utf-8", "ignore")
-    p = IndexParser(); p.feed(html)
-    base = index_url.rstrip("/") + "/"
-    return sorted(urllib.parse.urljoin(base, link) for link in p.links)
+# Apache directory indexes are regular enough that a single regex beats
+# tokenizing the whole page through html.parser in Python.
+_HREF_RE = re.compile(r'<a\s+href="([^"]+\.html)"', re.I)
 
-def extract_name(html_text):
-    m = re.search(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>',
-                  html_text, re.S | re.I)
-    if not m:
-        return None
+# Revalidation cache: ETag / Last-Modified per URL, bodies stored
+# gzip-compressed so re-runs against an unchanged Apache index cost one
+# conditional GET (304) per file instead of a full download.
+_CACHE_DIR   = os.path.join(os.path.expanduser("~"), ".cache", "bulk_mealie")
+_CACHE_INDEX = os.path.join(_CACHE_DIR, "urls.json")
+
+def _load_url_cache():
     try:
-        data = json.loads(m.group(1))
-        return data.get("name")
-    except json.JSONDecodeError:
-        return None
-
-def extract_tags(html_text):
-    m = re.search(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>',
-                  html_text, re.S | re.I)
+        with open(_CACHE_INDEX, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _save_url_cache(cache):
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    tmp = _CACHE_INDEX + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, _CACHE_INDEX)
+
+async def fetch_cached(session, url, cache):
+    """GET `url`, sending If-None-Match/If-Modified-Since when we have them;
+    on 304 Not Modified return the cached body without re-downloading."""
+    entry = cache.get(url) or {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    async with session.get(url, headers=headers) as r:
+        if r.status == 304:
+            with gzip.open(entry["body_path"], "rt",
+                           encoding="utf-8", errors="ignore") as f:
+                return f.read()
+        # 4xx/5xx bodies are error pages, not content — surface them to
+        # the callers' per-URL / sys.exit handling, never cache them
+        r.raise_for_status()
+        body = await r.text(errors="ignore")
+        etag     = r.headers.get("ETag")
+        last_mod = r.headers.get("Last-Modified")
+
+    if etag or last_mod:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        body_path = os.path.join(
+            _CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".gz")
+        with gzip.open(body_path, "wt", encoding="utf-8") as f:
+            f.write(body)
+        cache[url] = {"etag": etag, "last_modified": last_mod,
+                      "body_path": body_path}
+    return body
+
+async def fetch_listing(session, index_url, cache):
+    body = await fetch_cached(session, index_url, cache)
+    base = index_url.rstrip("/") + "/"
+    return sorted(urllib.parse.urljoin(base, h) for h in _HREF_RE.findall(body))
+
+async def fetch_all(session, urls, cache):
+    """Download every URL concurrently (bounded by DOWNLOAD_CONCURRENCY)."""
+    sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    async def bounded_fetch(url):
+        async with sem:
+            return await fetch_cached(session, url, cache)
+    return await asyncio.gather(*(bounded_fetch(u) for u in urls),
+                                return_exceptions=True)
+
+# Compiled once at import time; the JSON-LD block is searched for on every
+# downloaded page, so don't pay the pattern-cache lookup per call.
+_JSONLD_RE = re.compile(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>',
+                        re.S | re.I)
+_KEYWORD_SPLIT_RE = re.compile(r'[;,]')
+
+def parse_jsonld(html_text):
+    """Return (name, keywords) from a page's JSON-LD block in one pass."""
+    m = _JSONLD_RE.search(html_text)
     if not m:
-        return []
+        return None, []
     try:
-        data = json.loads(m.group(1))
-        keywords = data.get("keywords")
-        if isinstance(keywords, str):
-            return [s.strip() for s in re.split(r'[;,]', keywords)]
-        elif isinstance(keywords, list):
-            return keywords
-        else:
-            return []
-    except Exception:
-        return []
-
-def api_get(url, token):
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
-    with urllib.request.urlopen(req) as r:
-        return json.load(r)
-
-def api_delete(url, token):
-    req = urllib.request.Request(url,
-                                 headers={"Authorization": f"Bearer {token}"},
-                                 method="DELETE")
-    with urllib.request.urlopen(req) as r:
+        data = loads(m.group(1))
+    except ValueError:
+        return None, []
+    keywords = data.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [s.strip() for s in _KEYWORD_SPLIT_RE.split(keywords)]
+    elif not isinstance(keywords, list):
+        keywords = []
+    return data.get("name"), keywords
+
+def _build_indexes(items):
+    """Single pass over a recipe listing building canonical lookup indexes.
+
+    Returns (by_name, by_tag): by_name maps _canon(recipe name) to the
+    matching items; by_tag maps _canon(tag name or slug) to (item, tag)
+    pairs, keeping the tag object that matched for reporting.
+    """
+    by_name, by_tag = {}, {}
+    for item in items:
+        by_name.setdefault(_canon(item.get("name", "")), []).append(item)
+        seen = set()
+        for t in item.get("tags", []):
+            for key in {_canon(t.get("name", "")), _canon(t.get("slug", ""))}:
+                if key and key not in seen:
+                    seen.add(key)
+                    by_tag.setdefault(key, []).append((item, t))
+    return by_name, by_tag
+
+async def fetch_all_recipes(session, base_api, auth):
+    """Walk the paginated recipe list once and return its lookup indexes.
+
+    One bulk fetch up front replaces a ?search= round-trip per imported
+    recipe, so duplicate detection becomes a local dict lookup.
+    """
+    async def get_page(page):
+        # big pages + sparse fieldset: we only read id and name, so don't
+        # make the server serialize (and us parse) full recipe objects.
+        # Servers that don't support `fields` simply ignore it.
+        url = f"{base_api}?page={page}&perPage={LIST_PAGE_SIZE}&fields=id,name,tags"
+        async with session.get(url, headers=auth) as r:
+            return await r.json(loads=loads)
+
+    first = await get_page(1)
+    # Mealie serializes its envelope in camelCase (same as the perPage
+    # query param); accept the snake_case spelling too for older servers
+    total_pages = first.get("totalPages") or first.get("total_pages")
+    if total_pages:
+        rest = await asyncio.gather(*(get_page(p)
+                                      for p in range(2, total_pages + 1)))
+    else:
+        # unknown envelope shape: walk sequentially until a short page
+        # rather than silently treating the listing as one page
+        rest = []
+        data = first
+        page = 2
+        while len(data.get("items", [])) == LIST_PAGE_SIZE:
+            data = await get_page(page)
+            rest.append(data)
+            page += 1
+
+    items = [item for data in (first, *rest) for item in data.get("items", [])]
+    return _build_indexes(items)
+
+async def api_import(session, endpoint, auth, url):
+    """POST one recipe URL to Mealie's create-from-url endpoint."""
+    async with session.post(endpoint,
+                            json={"url": url, "includeTags": True},
+                            headers=auth) as r:
         return r.status
 
-def curl_import(token, server, url):
-    endpoint = server.rstrip("/") + "/api/recipes/create/url"
-    payload  = f'{{"url":"{url}","includeTags":true}}'
-    cmd = [
-        "curl", "-s", "-o", "/dev/null", "-w", "%{http_code}",
-        "-X", "POST", endpoint,
-        "-H", f"Authorization: Bearer {token}",
-        "-H", "Content-Type: application/json",
-        "-d", payload
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.stdout.strip()
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
 
+@functools.lru_cache(maxsize=4096)
 def _canon(text: str) -> str:
     """lower-case and strip all non-alphanumerics for robust comparisons"""
-    return re.sub(r"[^a-z0-9]", "", text.lower())
+    return _NON_ALNUM.sub("", text.lower())
 
-def delete_all_tagged(server: str, token: str, tag: str) -> None:
+async def delete_all_tagged(server: str, token: str, tag: str) -> None:
     """Delete every recipe that carries the specified tag (name or slug)."""
     base_api   = server.rstrip("/") + "/api/recipes"
-    page_size  = 100
-    page       = 1
-    victims    = []
     wanted     = _canon(tag)
-
-    while True:
-        url = f"{base_api}?page={page}&perPage={page_size}"
-        print(f"[DEBUG] curl -H 'Authorization: Bearer {token}' '{url}'")
-        data = api_get(url, token)
-        items = data.get("items", [])
-        print(f"[DEBUG] Got {len(items)} items from server")
-
-        if not items:
-            break
-
-        for item in items:
-            tag_objs = item.get("tags", [])
-            # pull 'name' and 'slug' from each tag object
-            tag_texts = [t.get("name", "") for t in tag_objs] + [t.get("slug", "") for t in tag_objs]
-            if any(_canon(t) == wanted for t in tag_texts):
-                victims.append(item)
-
-        if len(items) < page_size:
-            break
-        page += 1
-
-    # --- perform deletions ---
-    for item in victims:
-        rid   = item["id"]
-        name  = item.get("name", "(unnamed)")
-        match = next(t for t in item["tags"] if _canon(t.get("name", "")) == wanted or
-                                               _canon(t.get("slug", "")) == wanted)
-        status = api_delete(f"{base_api}/{rid}", token)
-        print(f"🗑  Deleted '{name}' (id {rid}) [tag: {match['name']}] → HTTP {status}")
+    auth       = {"Authorization": f"Bearer {token}"}
+
+    # raise_for_status: an expired token must fail loudly, not surface as
+    # an empty listing and a cheerful "Deleted 0 recipes"
+    connector = aiohttp.TCPConnector(limit=50, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector,
+                                     raise_for_status=True) as session:
+
+        _, by_tag = await fetch_all_recipes(session, base_api, auth)
+        victims = by_tag.get(wanted, [])
+
+        # --- perform deletions, bounded so Mealie isn't overwhelmed ---
+        sem = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def delete_one(item, match):
+            rid  = item["id"]
+            name = item.get("name", "(unnamed)")
+            async with sem:
+                try:
+                    async with session.delete(f"{base_api}/{rid}",
+                                              headers=auth) as r:
+                        status = r.status
+                except Exception as e:
+                    print(f"⚠️  delete error for '{name}' (id {rid}): {e}")
+                    return
+            print(f"🗑  Deleted '{name}' (id {rid}) [tag: {match['name']}] → HTTP {status}")
+
+        await asyncio.gather(*(delete_one(i, m) for i, m in victims))
 
     print(f"Deleted {len(victims)} recipes with tag '{tag}'.")
 
 
-def import_recipes(index_url, server, token, tag=None):
+async def import_recipes(index_url, server, token, tag=None):
     """
-    Download each *.html file in `index_url`, optionally filter by `tag`,
-    delete any recipe with the same name already on the Mealie server,
-    then import the fresh copy.
+    Download every *.html file in `index_url` concurrently, optionally filter
+    by `tag`, delete any recipe with the same name already on the Mealie
+    server, then import the fresh copy.  All network I/O (page downloads,
+    duplicate searches, deletions) runs on one shared aiohttp session.
     """
-    try:
-        recipe_urls = fetch_listing(index_url)
-    except Exception as e:
-        sys.exit(f"Unable to fetch index: {e}")
-
-    if not recipe_urls:
-        sys.exit("No .html files found.")
-
+    # loop invariants, computed once for the whole run
     base_api = server.rstrip("/") + "/api/recipes"
-
-    for url in recipe_urls:
-        try:
-            html = urllib.request.urlopen(url).read().decode("utf-8", "ignore")
-            name = extract_name(html)
-            tags = [t.strip().lower() for t in extract_tags(html)]
-        except Exception as e:
-            print(f"⚠️  {url}: cannot read/parse ({e})")
-            continue
-
-        if not name:
-            print(f"⚠️  {url}: no recipe name found")
-            continue
-
-        # If a tag filter is supplied, skip recipes that don’t contain it
-        if tag and tag.strip().lower() not in tags:
-            print(f"↩︎  Skipping '{name}' – tag '{tag}' not present in {tags}")
-            continue
-
-        # ---------- delete duplicates ----------
+    import_endpoint = base_api + "/create/url"
+    auth = {"Authorization": f"Bearer {token}"}
+    wanted_tag = tag.strip().lower() if tag else None
+
+    # one keep-alive pool serves the index host and Mealie for the whole
+    # run; raise_for_status turns auth/server errors into exceptions the
+    # per-URL and sys.exit handlers below actually see
+    connector = aiohttp.TCPConnector(limit=50, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector,
+                                     raise_for_status=True) as session:
+        url_cache = _load_url_cache()
         try:
-            data = api_get(f"{base_api}?search={urllib.parse.quote(name)}", token)
-            for item in data.get("items", []):
-                if item.get("name", "").lower() == name.lower():
-                    rid = item["id"]
-                    status = api_delete(f"{base_api}/{rid}", token)
-                    print(f"🗑  Deleted duplicate '{name}' (id {rid}) → HTTP {status}")
+            recipe_urls = await fetch_listing(session, index_url, url_cache)
         except Exception as e:
-            print(f"⚠️  delete error for '{name}': {e}")
-
-        # ---------- import fresh copy ----------
-        status = curl_import(token, server, url)
-        print(f"⬆️  Imported '{name}' → HTTP {status}")
+            sys.exit(f"Unable to fetch index: {e}")
+
+        if not recipe_urls:
+            sys.exit("No .html files found.")
+
+        pages = await fetch_all(session, recipe_urls, url_cache)
+        _save_url_cache(url_cache)
+        by_name, _ = await fetch_all_recipes(session, base_api, auth)
+
+        sem = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+        async def import_one(url, html):
+            if isinstance(html, Exception):
+                print(f"⚠️  {url}: cannot read ({html})")
+                return
+            try:
+                name, keywords = parse_jsonld(html)
+                tags = [t.strip().lower() for t in keywords]
+            except Exception as e:
+                print(f"⚠️  {url}: cannot parse ({e})")
+                return
+
+            if not name:
+                print(f"⚠️  {url}: no recipe name found")
+                return
+
+            # If a tag filter is supplied, skip recipes that don’t contain it
+            if wanted_tag and wanted_tag not in tags:
+                print(f"↩︎  Skipping '{name}' – tag '{tag}' not present in {tags}")
+                return
+
+            async with sem:
+                # ---------- delete duplicates ----------
+                # pop() also keeps the index accurate: a second page with
+                # the same name won't try to delete the same ids again
+                try:
+                    for item in by_name.pop(_canon(name), []):
+                        rid = item["id"]
+                        async with session.delete(f"{base_api}/{rid}",
+                                                  headers=auth) as r:
+                            status = r.status
+                        print(f"🗑  Deleted duplicate '{name}' (id {rid}) → HTTP {status}")
+                except Exception as e:
+                    print(f"⚠️  delete error for '{name}': {e}")
+
+                # ---------- import fresh copy ----------
+                try:
+                    status = await api_import(session, import_endpoint,
+                                              auth, url)
+                except Exception as e:
+                    print(f"⚠️  import error for '{name}': {e}")
+                    return
+                print(f"⬆️  Imported '{name}' → HTTP {status}")
+
+        await asyncio.gather(*(import_one(u, h)
+                               for u, h in zip(recipe_urls, pages)))
 
 
 def main():
@@ -228,14 +356,14 @@ def main():
         sys.exit("Provide --token or set the MEALIE_TOKEN environment variable.")
 
     if args.delete_tagged:
-        delete_all_tagged(args.server, token, args.delete_tagged)
+        asyncio.run(delete_all_tagged(args.server, token, args.delete_tagged))
         return
 
     if not args.index_url:
         sys.exit("--index-url is required when not using --delete-tagged.")
 
     # Import (optionally filtered by --tag)
-    import_recipes(args.index_url, args.server, token, tag=args.tag)
+    asyncio.run(import_recipes(args.index_url, args.server, token, tag=args.tag))
 
 
 if __name__ == "__main__":
@@ -12,20 +12,35 @@ parse_recipe_page.process_recipe_image on each one.
 """
 
 import argparse
+import asyncio
 import os
 from pathlib import Path
 
-from parse_recipe_page import process_recipe_image  # single-page worker
+from parse_recipe_page import (        # single-page worker + batch/pack variants
+    close_http_session,
+    get_client,
+    process_recipe_image,
+    process_recipe_images,
+    process_recipe_pack,
+)
 
 
 # ---------- batch helper -----------------------------------------------------
-def bulk_process_folder(input_dir: str,
-                        out_dir: str,
-                        api_key: str) -> None:
+async def bulk_process_folder(input_dir: str,
+                              out_dir: str,
+                              api_key: str,
+                              concurrency: int = 8,
+                              use_batch: bool = False,
+                              pack: int = 1,
+                              detail: str = "auto") -> None:
     """
     Run process_recipe_image on every PNG in `input_dir`.
     Assumes all *.png files live directly in that folder (no sub-dirs).
     Everything is written into `out_dir`.
+
+    Pages are independent and each one blocks on two OpenAI round-trips,
+    so up to `concurrency` of them run at once (keep it modest to stay
+    under OpenAI's rate limits).
     """
     root = Path(input_dir).expanduser().resolve()
     if not root.is_dir():
@@ -39,8 +54,45 @@ def bulk_process_folder(input_dir: str,
         print("No PNG files found.")
         return
 
-    for png in png_files:
-        process_recipe_image(str(png), str(out_path), api_key)
+    # one client for the whole folder; reinstantiating per page would cost a
+    # fresh httpx pool and TLS handshake on every call
+    client = get_client(api_key)
+
+    try:
+        if use_batch:
+            # Batch API: half the per-token cost and a separate rate-limit
+            # pool, at the price of up to 24 h turnaround.
+            await process_recipe_images(png_files, str(out_path), client)
+            return
+
+        sem = asyncio.Semaphore(concurrency)
+        img_tasks: list[asyncio.Task] = []
+
+        async def process_one(png: Path) -> None:
+            async with sem:
+                await process_recipe_image(str(png), str(out_path), client,
+                                           img_tasks=img_tasks, detail=detail)
+
+        async def process_group(group: list[Path]) -> None:
+            async with sem:
+                await process_recipe_pack(group, str(out_path), client,
+                                          img_tasks=img_tasks)
+
+        if pack > 1:
+            # pack several pages per request: divides requests-per-minute
+            # pressure by the pack size, still concurrent across packs
+            groups = [png_files[i:i + pack]
+                      for i in range(0, len(png_files), pack)]
+            await asyncio.gather(*(process_group(g) for g in groups))
+        else:
+            await asyncio.gather(*(process_one(png) for png in png_files))
+
+        # Hero-image generation was submitted in the background so it
+        # overlaps with later pages' parses; wait for the stragglers.
+        if img_tasks:
+            await asyncio.gather(*img_tasks)
+    finally:
+        await close_http_session()
 
 
 # ---------- CLI --------------------------------------------------------------
@@ -49,13 +101,29 @@ def main() -> None:
     ap.add_argument("input_dir", help="Folder containing PNG pages")
     ap.add_argument("--out-dir", default="recipes_parsed", help="Where to write *.html and images")
     ap.add_argument("--api-key", help="OpenAI API key (or set env OPENAI_API_KEY)")
+    ap.add_argument("--concurrency", type=int, default=8,
+                    help="How many pages to process at once (default 8)")
+    ap.add_argument("--batch", action="store_true",
+                    help="Submit all pages through the OpenAI Batch API "
+                         "(cheaper, but up to 24h turnaround)")
+    ap.add_argument("--pack", type=int, default=1,
+                    help="Pages to pack into each request (default 1); "
+                         "eases requests-per-minute pressure")
+    ap.add_argument("--detail", choices=("auto", "low", "high"), default="auto",
+                    help="Vision detail level for per-page parses; 'auto' "
+                         "pre-classifies each page at low detail first "
+                         "(batch/pack paths always use high)")
     args = ap.parse_args()
 
     api_key = args.api_key or os.getenv("OPENAI_API_KEY")
     if not api_key:
         ap.error("Provide --api-key or set OPENAI_API_KEY in the environment.")
 
-    bulk_process_folder(args.input_dir, args.out_dir, api_key)
+    asyncio.run(bulk_process_folder(args.input_dir, args.out_dir, api_key,
+                                    concurrency=args.concurrency,
+                                    use_batch=args.batch,
+                                    pack=args.pack,
+                                    detail=args.detail))
 
 
 if __name__ == "__main__":
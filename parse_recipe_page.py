@@ -11,14 +11,48 @@ Can be imported and called as a function, or run as a CLI.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
+import hashlib
+import io
 import json
 import os
+import random
 import re
+import shutil
 from pathlib import Path
 
+import aiohttp
+import httpx
 import openai
-import requests
+from PIL import Image
+
+try:
+    # optional: Rust/SIMD JSON, ~3-10× faster than stdlib on the post-API
+    # parse/serialize hot path
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    def _json_dumps_indent(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _json_dumps_indent_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _json_dumps_indent(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    def _json_dumps_indent_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Where the PNGs will live once they’re copied to your web‑server.
@@ -28,9 +62,12 @@ import requests
 BASE_IMAGE_URL = "https://tidalwave.online/samba1/quick_share/recipes/"
 # ────────────────────────────────────────────────────────────────────────────────
 
+# Vision model used for page parsing (also part of the parse-cache key).
+PARSE_MODEL = "gpt-4.1"
+
 
 # ---------- Prompt sent to GPT‑4o ------------------------------------------------
-SYSTEM_PROMPT = f"""
+SYSTEM_PROMPT = """
 You are a cookbook digitization assistant for importing recipes into Mealie.
 You will be sent a scanned cookbook page (a PNG). The page may contain:
   • zero recipes (e.g., TOC, dedication, photo page)
@@ -38,197 +75,629 @@ You will be sent a scanned cookbook page (a PNG). The page may contain:
   • multiple recipes
 
 Your job:
-1. Carefully analyze the image and, for each recipe present, output a single block in valid JSON‑LD format, inside a <script type="application/ld+json"> … </script> tag. Use the Recipe specification from https://schema.org/Recipe.
+1. Carefully analyze the image and return every recipe present through the structured output schema, following the Recipe specification from https://schema.org/Recipe.
 2. Fill out these fields if possible:
-   - @context, @type, name, author, description, datePublished, prepTime, cookTime, totalTime, recipeYield, keywords, image, recipeIngredient, recipeInstructions
-   - Use "@type": "Recipe" for each, and "@type": "HowToStep" for each step in recipeInstructions.
+   - name, author, description, datePublished, prepTime, cookTime, totalTime, recipeYield, keywords, recipeIngredient, recipeInstructions
+   - Use "@context": "https://schema.org" and "@type": "Recipe" for each recipe, and "@type": "HowToStep" for each step in recipeInstructions.
    - For "keywords", always include "My Sisters' Kitchen" first, then one of these valid section keywords as the second (choose the best fit based on the recipe):
         "Appetizers", "Soups", "Salads", "Beverages", "Side Dishes", "Entrees", "Baked Goods", "Desserts", "Other"
-   - For "image", build the URL like this: "{BASE_IMAGE_URL}<slug>.png" where <slug> is the kebab‑style file name you will output.
-   - If you cannot determine a value, leave it out rather than guessing, except for times or yields, where you may estimate a reasonable value if typical for that recipe type.
+   - If you cannot determine a value, return null rather than guessing, except for times or yields, where you may estimate a reasonable value if typical for that recipe type.
 
 3. Try to capture every step of the instructions as a separate HowToStep. List each ingredient on its own line.
 
-4. For **each recipe**, output a file with this naming style:
-   - Lowercase, spaces and punctuation replaced with underscores, ".html" extension (e.g. "apple_walnut_cranberry_salad.html").
-   - The contents of each file should be the <script type="application/ld+json">…</script> block for that recipe, and nothing else.
+4. Leave "image" as null; the final image URL is filled in downstream.
 
-5. If there is more than one recipe on the page, output multiple files (one per recipe), with their correct filenames and contents as above.
+5. When a request contains multiple images, set each recipe's "page" to the 1-based index of the image it came from; otherwise set "page" to null.
 
-6. If there is NO recipe content on the page, respond with exactly: <no recipe>
-Do NOT return Markdown, JSON arrays, commentary, or separators – only output the plain text files as specified, or <no recipe>.
+6. If there is NO recipe content on the page, return an empty "recipes" list.
+"""
 
-7. Do NOT use Markdown formatting, code fences, or language labels. Output only the contents of the HTML file, starting with <script type=…>, nothing else.
+# ---------- Compiled regexes (these run per recipe, per page) --------------------
+# group(0) is the whole <script> block, group(1) the JSON-LD body — one pass
+# gives us both, so no second search is needed to strip the tags.
+_SCRIPT_RE = re.compile(
+    r"<script type=\"application/ld\+json\">(.*?)</script>",
+    re.DOTALL | re.IGNORECASE,
+)
+# Slug table: keep [a-z0-9], map every other codepoint to "_".  A C-level
+# str.translate beats firing up the regex engine per recipe name; the
+# __missing__ hook covers characters outside the precomputed range.
+class _SlugTable(dict):
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+_SLUG_TABLE = _SlugTable(
+    str.maketrans({c: c for c in "abcdefghijklmnopqrstuvwxyz0123456789"})
+)
+
+# ---------- Structured-output schema --------------------------------------------
+# Strict mode needs every property listed in `required`; optional fields are
+# nullable instead.  Getting parsed JSON straight back means no HTML
+# boilerplate in the model output (fewer tokens, faster TTFT) and no
+# scraping of the response; the <script> wrapper is rebuilt locally.
+_HOWTO_STEP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "@type": {"type": "string"},
+        "text": {"type": "string"},
+    },
+    "required": ["@type", "text"],
+    "additionalProperties": False,
+}
+
+_RECIPE_FIELDS = {
+    "@context": {"type": "string"},
+    "@type": {"type": "string"},
+    "name": {"type": "string"},
+    "author": {"type": ["string", "null"]},
+    "description": {"type": ["string", "null"]},
+    "datePublished": {"type": ["string", "null"]},
+    "prepTime": {"type": ["string", "null"]},
+    "cookTime": {"type": ["string", "null"]},
+    "totalTime": {"type": ["string", "null"]},
+    "recipeYield": {"type": ["string", "null"]},
+    "keywords": {"type": "string"},
+    "image": {"type": ["string", "null"]},
+    "recipeIngredient": {"type": "array", "items": {"type": "string"}},
+    "recipeInstructions": {"type": "array", "items": _HOWTO_STEP_SCHEMA},
+    "page": {
+        "type": ["integer", "null"],
+        "description": "1-based source image index in multi-image requests",
+    },
+}
+
+_RECIPES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recipes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": _RECIPE_FIELDS,
+                "required": list(_RECIPE_FIELDS),
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["recipes"],
+    "additionalProperties": False,
+}
+
+# Responses API text.format flavour of the same schema.
+_TEXT_FORMAT = {
+    "format": {
+        "type": "json_schema",
+        "name": "recipes",
+        "schema": _RECIPES_SCHEMA,
+        "strict": True,
+    }
+}
 
-8. Name each file using the recipe name, all lowercase, spaces and punctuation replaced with underscores, and the .html extension.
-"""
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Helper functions
 # ────────────────────────────────────────────────────────────────────────────────
 
+_CLIENT: openai.AsyncOpenAI | None = None
+_HTTP: aiohttp.ClientSession | None = None
+
+
+def get_client(api_key: str) -> openai.AsyncOpenAI:
+    """Process-wide AsyncOpenAI singleton.
+
+    Repeated construction would re-create the underlying httpx client,
+    TLS context and connection pool on every call site.
+
+    Explicit timeouts keep one stalled request from blocking its task
+    forever; the SDK's built-in retries are disabled so backoff policy
+    lives in one place (_with_retries) and retries stay inside the
+    caller's concurrency semaphore.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = openai.AsyncOpenAI(
+            api_key=api_key,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            max_retries=0,
+        )
+    return _CLIENT
+
+
+def _http_session() -> aiohttp.ClientSession:
+    """Shared keep-alive session for hero-image downloads."""
+    global _HTTP
+    if _HTTP is None or _HTTP.closed:
+        _HTTP = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60))
+    return _HTTP
+
+
+async def close_http_session() -> None:
+    """Close the shared download session (call once per asyncio.run)."""
+    if _HTTP is not None and not _HTTP.closed:
+        await _HTTP.close()
+
+
+async def _with_retries(make_call, attempts: int = 3):
+    """Await `make_call()` with jittered exponential backoff on transient
+    OpenAI failures, so one 429 or dropped connection doesn't lose a page."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await make_call()
+        except (openai.RateLimitError, openai.APITimeoutError,
+                openai.APIConnectionError):
+            if attempt == attempts:
+                raise
+            await asyncio.sleep(min(2 ** attempt + random.random(), 30))
+
+
+def _png_fingerprint(path: str | Path, detail: str = "high") -> str:
+    """Key for the parse-response cache.
+
+    Hashes the scan bytes together with the system prompt and model, so
+    editing the prompt or switching models invalidates stale entries
+    instead of silently replaying them.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(path).read_bytes())
+    h.update(SYSTEM_PROMPT.encode())
+    h.update(PARSE_MODEL.encode())
+    if detail != "high":
+        # low-detail parses can legitimately differ from high-detail ones
+        h.update(detail.encode())
+    return h.hexdigest()
+
+
+def _page_b64(image_path: Path) -> str:
+    """Downscale a scan to GPT-4o's tile budget and base64 it as JPEG.
+
+    The provider silently downscales anything past ~2048 px, so sending a
+    4000×3000 PNG pays vision tokens (and upload time) for pixels that get
+    thrown away.  Cap the long side at a 512-px tile multiple ≤2048 and
+    recompress as JPEG — scans don't need transparency and the payload
+    shrinks 5-10×.  Encoding happens straight from the in-memory buffer.
+    """
+    img = Image.open(image_path)
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    long_side = max(img.size)
+    target = min(2048, max(512, (long_side // 512) * 512))
+    if long_side > target:
+        img.thumbnail((target, target), Image.LANCZOS)
+
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=90, optimize=True)
+    return base64.b64encode(buf.getbuffer()).decode("ascii")
+
+
+def _parse_request_body(b64: str, detail: str = "high") -> dict:
+    """The Responses API request body for one page; shared by the live
+    call and the Batch API JSONL lines.
+
+    SYSTEM_PROMPT must stay byte-identical across calls and always be the
+    first input item: OpenAI's automatic prompt caching matches on the
+    request prefix, so keeping everything per-page (the image payload)
+    after the stable prompt lets repeated calls reuse the cached prefix.
+    """
+    return {
+        "model": PARSE_MODEL,
+        "input": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_image",
+                        "image_url": "data:image/jpeg;base64," + b64,
+                        "detail": detail,
+                    }
+                ],
+            },
+        ],
+        "text": _TEXT_FORMAT,
+        "max_output_tokens": 2048,
+        "temperature": 0.2,
+    }
+
+
+def _recipes_to_raw_text(recipes: list[dict]) -> str:
+    """Rebuild the cached/on-disk representation (script blocks, or the
+    <no recipe> sentinel) from structured-output recipe dicts."""
+    blocks = []
+    for recipe in recipes:
+        clean = {k: v for k, v in recipe.items()
+                 if v is not None and k != "page"}
+        blocks.append(
+            "<script type=\"application/ld+json\">\n"
+            + _json_dumps_indent(clean)
+            + "\n</script>"
+        )
+    return "\n".join(blocks) if blocks else "<no recipe>"
+
+
+def _batch_output_text(body: dict) -> str:
+    """Pull the assistant text out of a raw Responses API body dict
+    (batch output lines are plain JSON, with no SDK `output_text`
+    convenience property)."""
+    for item in body.get("output", []):
+        if item.get("type") == "message":
+            for part in item.get("content", []):
+                if part.get("type") == "output_text":
+                    return part.get("text", "")
+    return ""
+
+
+def _content_to_raw_text(content: str) -> str:
+    """Convert one page's structured-output message content to raw_text."""
+    try:
+        recipes = _json_loads(content).get("recipes") or []
+    except (ValueError, AttributeError):
+        # model fell back to plain text; let the downstream regex decide
+        return content
+    return _recipes_to_raw_text(recipes)
+
+
 def generate_menu_image_prompt(
     recipe_name: str,
     recipe_desc: str,
     recipe_ingredients: list[str],
-    recipe_instructions: list[str | dict[str, str]],
+    instr_texts: list[str],
 ) -> str:
-    """Craft an image‑generation prompt for the finished dish."""
-
-    ingredients_str = ", ".join(recipe_ingredients) if recipe_ingredients else ""
-    instructions_str = " ".join(
-        step if isinstance(step, str) else step.get("text", "")
-        for step in (recipe_instructions or [])
-    )
-
-    return (
-        f"High‑quality, realistic photograph of the completed dish '{recipe_name}', "
-        f"as it would appear freshly prepared and ready to serve in a professional recipe website photo. "
-        f"{recipe_desc.strip() + ' ' if recipe_desc else ''}"
-        f"Show only the finished dish, attractively plated, isolated on a neutral background. "
-        f"All visible food should be fully prepared, cooked, and presented exactly as described in the recipe, "
-        f"with edible garnishes only—no text, no labels, no packaging, no kitchen tools, no hands, no inedible parts. "
-        f"Include only items from these ingredients: {ingredients_str}. "
-        f"Present the food in a way that matches the steps: {instructions_str}. "
-        f"The focus should be entirely on the finished, edible dish, as it would be served."
-    )
-
-
-def generate_menu_image(
+    """Craft an image‑generation prompt for the finished dish.
+
+    `instr_texts` is plain step text — callers normalize HowToStep dicts
+    up front, so this builder is two flat joins with no per-step
+    isinstance checks or intermediate f-string concatenations.
+    """
+
+    return "".join([
+        f"High‑quality, realistic photograph of the completed dish '{recipe_name}', ",
+        "as it would appear freshly prepared and ready to serve in a professional recipe website photo. ",
+        recipe_desc.strip() + " " if recipe_desc else "",
+        "Show only the finished dish, attractively plated, isolated on a neutral background. ",
+        "All visible food should be fully prepared, cooked, and presented exactly as described in the recipe, ",
+        "with edible garnishes only—no text, no labels, no packaging, no kitchen tools, no hands, no inedible parts. ",
+        "Include only items from these ingredients: ",
+        ", ".join(recipe_ingredients) if recipe_ingredients else "",
+        ". Present the food in a way that matches the steps: ",
+        " ".join(instr_texts),
+        ". The focus should be entirely on the finished, edible dish, as it would be served.",
+    ])
+
+
+async def generate_menu_image(
     recipe_name: str,
     recipe_desc: str,
     recipe_ingredients: list[str],
     recipe_instructions: list[str | dict[str, str]],
     output_path: Path,
-    api_key: str,
+    client: openai.AsyncOpenAI,
+    cache_dir: Path | None = None,
 ) -> None:
     """Generate the hero image for a recipe using OpenAI’s Images API."""
 
-    client = openai.OpenAI(api_key=api_key)
-
+    instr_texts = [step if isinstance(step, str) else step.get("text", "")
+                   for step in (recipe_instructions or [])]
     prompt = generate_menu_image_prompt(
-        recipe_name, recipe_desc, recipe_ingredients, recipe_instructions
+        recipe_name, recipe_desc, recipe_ingredients, instr_texts
     )
 
+    # file I/O runs via to_thread throughout this coroutine: many image
+    # tasks share the event loop, and a slow disk would stall all of them
     prompt_path = output_path.with_suffix(".prompt.txt")
-    prompt_path.write_text(prompt, encoding="utf‑8")
+    await asyncio.to_thread(prompt_path.write_text, prompt, encoding="utf‑8")
     print(f"✓ Prompt saved to {prompt_path}")
 
+    # Identical prompt ⇒ identical request; reuse the cached image instead
+    # of re-spending on gpt-image-1.
+    img_cache = None
+    if cache_dir is not None:
+        key = hashlib.blake2b(prompt.encode()).hexdigest()
+        img_cache = cache_dir / f"img_{key}.png"
+        if img_cache.exists():
+            await asyncio.to_thread(
+                lambda: output_path.write_bytes(img_cache.read_bytes()))
+            print(f"✓ Image restored from cache for {recipe_name}")
+            return
+
     try:
-        response = client.images.generate(
+        response = await _with_retries(lambda: client.images.generate(
             model="gpt-image-1",
             prompt=prompt,
             n=1,
             size="1536x1024",
             quality="high",
-        )
+        ))
         data = response.data[0]
         if getattr(data, "url", None):
-            img_bytes = requests.get(data.url).content
+            # stream to disk in 64 KiB chunks rather than buffering the
+            # whole PNG; with many image tasks in flight the full-buffer
+            # path multiplies RSS by the concurrency
+            async with _http_session().get(data.url) as r:
+                f = await asyncio.to_thread(output_path.open, "wb")
+                try:
+                    async for chunk in r.content.iter_chunked(64 * 1024):
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
         elif getattr(data, "b64_json", None):
-            img_bytes = base64.b64decode(data.b64_json)
+            img_bytes = base64.decodebytes(data.b64_json.encode("ascii"))
+            await asyncio.to_thread(output_path.write_bytes, img_bytes)
         else:
             print(f"Image generation failed for {recipe_name}: No data returned.")
             return
 
-        output_path.write_bytes(img_bytes)
+        if img_cache is not None:
+            img_cache.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(shutil.copyfile, output_path, img_cache)
         print(f"✓ Image saved to {output_path}")
     except Exception as exc:
         print(f"Image generation failed for {recipe_name}: {exc}")
 
 
-def gpt4o_parse_image(image_path: Path, api_key: str) -> str:
-    """Send the PNG to GPT‑4o and return its raw response text."""
-
-    b64 = base64.b64encode(image_path.read_bytes()).decode()
-    client = openai.OpenAI(api_key=api_key)
-
-    response = client.chat.completions.create(
-        model="gpt-4.1",
-        messages=[
+async def _page_has_recipe(b64: str, client: openai.AsyncOpenAI) -> bool:
+    """Cheap yes/no pre-pass at detail:"low" (85 vision tokens flat).
+
+    A high-detail parse costs ~765-2000+ vision tokens, which is wasted on
+    dedication/TOC/photo pages that come back as <no recipe>.  Asking the
+    low-detail question first and only escalating on "yes" skips that
+    premium for the empty pages.
+    """
+    response = await _with_retries(lambda: client.responses.create(
+        model=PARSE_MODEL,
+        input=[{
+            "role": "user",
+            "content": [
+                {
+                    "type": "input_text",
+                    "text": ("Does this scanned cookbook page contain any "
+                             "recipe text (ingredients or instructions)? "
+                             "Answer yes or no."),
+                },
+                {
+                    "type": "input_image",
+                    "image_url": "data:image/jpeg;base64," + b64,
+                    "detail": "low",
+                },
+            ],
+        }],
+        max_output_tokens=16,
+        temperature=0,
+    ))
+    answer = (response.output_text or "").strip().lower()
+    return answer.startswith("y")
+
+
+async def gpt4o_parse_image(image_path: Path, client: openai.AsyncOpenAI,
+                            cache_dir: Path | None = None,
+                            detail: str = "auto") -> str:
+    """Send the PNG to GPT‑4o and return its raw response text.
+
+    When `cache_dir` is given, responses are cached by the scan's content
+    hash so re-running over a partially processed folder never re-sends an
+    unchanged page to the API.
+
+    `detail` is "auto" (default: a low-detail pre-classifier decides
+    whether the full high-detail parse is worth it), or "low"/"high" to
+    force one level for every page.
+    """
+
+    effective = "high" if detail == "auto" else detail
+    cache_file = None
+    neg_cache_file = None
+    if cache_dir is not None:
+        cache_file = cache_dir / f"{_png_fingerprint(image_path, effective)}.txt"
+        if cache_file.exists():
+            print(f"✓ Cached parse for {image_path.name}")
+            return cache_file.read_text(encoding="utf-8")
+        if detail == "auto":
+            # pre-classifier negatives get their own key: a forced
+            # --detail high rerun must trigger the real parse, not be
+            # served the low-detail verdict back
+            neg_cache_file = (
+                cache_dir / f"{_png_fingerprint(image_path, 'auto')}.txt")
+            if neg_cache_file.exists():
+                print(f"✓ Cached parse for {image_path.name}")
+                return neg_cache_file.read_text(encoding="utf-8")
+
+    b64 = _page_b64(image_path)
+
+    if detail == "auto" and not await _page_has_recipe(b64, client):
+        print(f"  (pre-classifier: no recipe on {image_path.name}, "
+              "skipping high-detail parse)")
+        raw_text = "<no recipe>"
+        if neg_cache_file is not None:
+            neg_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            neg_cache_file.write_text(raw_text, encoding="utf-8")
+        return raw_text
+
+    body = _parse_request_body(b64, detail=effective)
+    response = await _with_retries(
+        lambda: client.responses.create(**body)
+    )
+    raw_text = _content_to_raw_text(response.output_text.strip())
+
+    # surface the server-side prompt-cache hit rate so prompt-length tuning
+    # has something to go on
+    details = getattr(getattr(response, "usage", None),
+                      "input_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+    if cached_tokens:
+        print(f"  (prompt cache: {cached_tokens} tokens reused for {image_path.name})")
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(raw_text, encoding="utf-8")
+    return raw_text
+
+
+async def gpt4o_parse_images_packed(image_paths: list[Path],
+                                    client: openai.AsyncOpenAI) -> list[str]:
+    """Parse several pages with ONE multi-image request.
+
+    Vision workloads tend to hit the requests-per-minute limit before the
+    token limit, so packing k pages into a single user message amortizes
+    the system prompt and divides RPM pressure by k.  The schema's "page"
+    field says which image each recipe came from, so the response can be
+    split back into per-page chunks, returned in input order.
+
+    Raises ValueError when the response is truncated, isn't valid JSON,
+    or a recipe lacks a usable page index — a failed pack must surface as
+    an error rather than k confident "<no recipe>" results, because the
+    caller writes each chunk to the content-hash cache.
+    """
+
+    content: list[dict] = [{
+        "type": "input_text",
+        "text": (
+            f"Process each of the {len(image_paths)} images in order. "
+            "For every recipe, set its \"page\" field to the 1-based index "
+            "of the image it came from."
+        ),
+    }]
+    for p in image_paths:
+        content.append({
+            "type": "input_image",
+            "image_url": "data:image/jpeg;base64," + _page_b64(p),
+            "detail": "high",
+        })
+
+    response = await _with_retries(lambda: client.responses.create(
+        model=PARSE_MODEL,
+        input=[
             {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/png;base64,{b64}",
-                            "detail": "high",
-                        },
-                    }
-                ],
-            },
+            {"role": "user", "content": content},
         ],
-        max_tokens=2048,
+        text=_TEXT_FORMAT,
+        max_output_tokens=2048 * len(image_paths),
         temperature=0.2,
-    )
-    return response.choices[0].message.content.strip()
+    ))
+    if getattr(response, "status", None) == "incomplete":
+        reason = getattr(getattr(response, "incomplete_details", None),
+                         "reason", None)
+        raise ValueError(f"packed response incomplete ({reason or 'unknown'})")
+    raw = response.output_text.strip()
+
+    # Group recipes by their "page" index; pages with none come back as
+    # <no recipe>.
+    try:
+        recipes = _json_loads(raw).get("recipes") or []
+    except ValueError as err:
+        raise ValueError(f"packed response is not valid JSON: {err}") from err
+    per_page: list[list[dict]] = [[] for _ in image_paths]
+    for recipe in recipes:
+        page_no = recipe.get("page")
+        if not isinstance(page_no, int) or not 1 <= page_no <= len(image_paths):
+            raise ValueError(
+                f"recipe {recipe.get('name')!r} has no usable page index "
+                f"({page_no!r})")
+        per_page[page_no - 1].append(recipe)
+    return [_recipes_to_raw_text(group) for group in per_page]
 
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Core processing
 # ────────────────────────────────────────────────────────────────────────────────
 
-def process_recipe_image(
+async def process_recipe_image(
     png_path: str | Path,
     out_dir: str | Path,
-    api_key: str,
-) -> None:
-    """Parse one scanned page and emit HTML + PNG files for each recipe found."""
+    client: openai.AsyncOpenAI,
+    img_tasks: list[asyncio.Task] | None = None,
+    detail: str = "auto",
+) -> list[tuple[str, dict]]:
+    """Parse one scanned page and emit HTML + PNG files for each recipe found.
+
+    Returns a list of (slug, recipe_data) pairs so callers can use the
+    already-parsed recipes directly instead of re-reading and re-parsing
+    the .html files this function just wrote.
+
+    Hero-image generation takes ~20 s per recipe and is independent of the
+    next page's parse, so it is submitted as a background task rather than
+    awaited inline.  Callers processing many pages can pass a shared
+    `img_tasks` list and gather it once at the end; when `img_tasks` is
+    omitted the tasks are awaited before returning.
+    """
 
     png_path = Path(png_path).expanduser().resolve()
     out_dir = Path(out_dir).expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    raw_text = gpt4o_parse_image(png_path, api_key)
+    own_tasks = img_tasks is None
+    if own_tasks:
+        img_tasks = []
+
+    cache_dir = out_dir / ".cache"
+
+    raw_text = await gpt4o_parse_image(png_path, client, cache_dir=cache_dir,
+                                       detail=detail)
+    recipes = _emit_recipes(raw_text, png_path, out_dir)
+    _queue_menu_images(recipes, out_dir, client, cache_dir, img_tasks)
+
+    if own_tasks and img_tasks:
+        await asyncio.gather(*img_tasks)
+
+    return recipes
+
+
+def _emit_recipes(raw_text: str, png_path: Path,
+                  out_dir: Path) -> list[tuple[str, dict]]:
+    """Write one .html file per recipe in a model response; return the
+    (slug, recipe_data) pairs."""
+
     if raw_text.lower() == "<no recipe>":
         print(f"[{png_path}] – no recipe detected.")
-        return
+        return []
 
-    # Extract every <script …>…</script> block
-    scripts = re.findall(
-        r"(<script type=\"application/ld\+json\">.*?</script>)",
-        raw_text,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    if not scripts:
+    # Extract every <script …>…</script> block, capturing the JSON-LD body
+    matches = list(_SCRIPT_RE.finditer(raw_text))
+    if not matches:
         print(f"[{png_path}] – no recipe scripts found.")
-        return
-
-    for script_block in scripts:
-        # Pull the JSON text out of the <script> tag
-        m = re.search(
-            r"<script[^>]*>(.*?)</script>", script_block, flags=re.DOTALL | re.IGNORECASE
-        )
-        if not m:
-            print("Warning: could not extract JSON‑LD block.")
-            continue
+        return []
 
+    recipes: list[tuple[str, dict]] = []
+    for m in matches:
         try:
-            recipe_data = json.loads(m.group(1).strip())
+            recipe_data = _json_loads(m.group(1).strip())
         except Exception as err:
             print(f"Error parsing JSON‑LD: {err}")
             continue
 
         name = recipe_data.get("name", png_path.stem)
-        slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+        slug = name.lower().translate(_SLUG_TABLE)
+        while "__" in slug:
+            slug = slug.replace("__", "_")
+        slug = slug.strip("_")
 
         # Build and inject the image URL
         recipe_data["image"] = f"{BASE_IMAGE_URL}{slug}.png"
 
-        # Re‑serialize the fixed JSON‑LD
-        script_fixed = (
-            "<script type=\"application/ld+json\">\n"
-            + json.dumps(recipe_data, ensure_ascii=False, indent=2)
-            + "\n</script>"
+        # Re‑serialize the fixed JSON‑LD and land it in one write() of
+        # ready-made bytes — write_text would re-encode the str and the
+        # serializer (orjson when present) already produces UTF-8 bytes
+        payload = (
+            b"<script type=\"application/ld+json\">\n"
+            + _json_dumps_indent_bytes(recipe_data)
+            + b"\n</script>\n"
         )
 
         out_html = out_dir / f"{slug}.html"
-        out_html.write_text(script_fixed + "\n", encoding="utf‑8")
+        out_html.write_bytes(payload)
         print(f"✓ Saved {out_html}")
+        recipes.append((slug, recipe_data))
+
+    return recipes
+
 
-        # Generate hero image
+def _queue_menu_images(recipes: list[tuple[str, dict]], out_dir: Path,
+                       client: openai.AsyncOpenAI, cache_dir: Path,
+                       img_tasks: list[asyncio.Task]) -> None:
+    """Submit a hero-image generation task for each parsed recipe."""
+
+    for slug, recipe_data in recipes:
+        name = recipe_data.get("name", slug)
         desc = recipe_data.get("description", "")
         ingredients = recipe_data.get("recipeIngredient", [])
         instructions = [
@@ -236,7 +705,167 @@ def process_recipe_image(
             for step in recipe_data.get("recipeInstructions", [])
         ]
         img_path = out_dir / f"{slug}.png"
-        generate_menu_image(name, desc, ingredients, instructions, img_path, api_key)
+        img_tasks.append(asyncio.create_task(
+            generate_menu_image(name, desc, ingredients, instructions, img_path,
+                                client, cache_dir=cache_dir)
+        ))
+
+
+async def process_recipe_pack(
+    png_paths: list[str | Path],
+    out_dir: str | Path,
+    client: openai.AsyncOpenAI,
+    img_tasks: list[asyncio.Task] | None = None,
+) -> list[tuple[str, dict]]:
+    """process_recipe_image for a small pack of pages via one request.
+
+    Cached pages are served locally; only the rest go to the model, packed
+    into a single multi-image call.
+    """
+
+    out_dir = Path(out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = out_dir / ".cache"
+
+    own_tasks = img_tasks is None
+    if own_tasks:
+        img_tasks = []
+
+    recipes: list[tuple[str, dict]] = []
+    to_parse: list[Path] = []
+    for p in png_paths:
+        png_path = Path(p).expanduser().resolve()
+        cache_file = cache_dir / f"{_png_fingerprint(png_path)}.txt"
+        if cache_file.exists():
+            print(f"✓ Cached parse for {png_path.name}")
+            cached = _emit_recipes(cache_file.read_text(encoding="utf-8"),
+                                   png_path, out_dir)
+            _queue_menu_images(cached, out_dir, client, cache_dir, img_tasks)
+            recipes.extend(cached)
+        else:
+            to_parse.append(png_path)
+
+    if to_parse:
+        try:
+            chunks = await gpt4o_parse_images_packed(to_parse, client)
+        except ValueError as err:
+            # a bad pack (truncated/unparseable response, missing page
+            # indexes) must not cache "<no recipe>" for k real pages;
+            # fall back to individual parses, which cache per page and
+            # degrade safely on parse failure
+            print(f"Packed parse failed ({err}); "
+                  "retrying these pages individually.")
+            chunks = await asyncio.gather(*(
+                gpt4o_parse_image(p, client, cache_dir=cache_dir,
+                                  detail="high")
+                for p in to_parse))
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for png_path, raw_text in zip(to_parse, chunks):
+            cache_file = cache_dir / f"{_png_fingerprint(png_path)}.txt"
+            cache_file.write_text(raw_text, encoding="utf-8")
+            parsed = _emit_recipes(raw_text, png_path, out_dir)
+            _queue_menu_images(parsed, out_dir, client, cache_dir, img_tasks)
+            recipes.extend(parsed)
+
+    if own_tasks and img_tasks:
+        await asyncio.gather(*img_tasks)
+
+    return recipes
+
+
+async def process_recipe_images(
+    png_paths: list[str | Path],
+    out_dir: str | Path,
+    client: openai.AsyncOpenAI,
+    poll_interval: float = 30.0,
+) -> list[tuple[str, dict]]:
+    """Parse many scanned pages in one OpenAI Batch API submission.
+
+    Builds a JSONL request per page (identical body to the live call),
+    uploads it, and polls the batch with capped exponential backoff until
+    it finishes — half the per-token cost of interactive calls and a
+    separate rate-limit pool, in exchange for up to 24 h of turnaround.
+    Pages whose parse is already cached skip the batch entirely.  Hero
+    images still go through generate_menu_image, which overlaps them and
+    reuses its prompt-keyed cache.
+    """
+
+    out_dir = Path(out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = out_dir / ".cache"
+
+    recipes: list[tuple[str, dict]] = []
+    img_tasks: list[asyncio.Task] = []
+
+    # cache hits don't need a batch line; custom_id maps results back
+    pending: dict[str, Path] = {}
+    lines = []
+    for p in png_paths:
+        png_path = Path(p).expanduser().resolve()
+        cache_file = cache_dir / f"{_png_fingerprint(png_path)}.txt"
+        if cache_file.exists():
+            print(f"✓ Cached parse for {png_path.name}")
+            cached = _emit_recipes(cache_file.read_text(encoding="utf-8"),
+                                   png_path, out_dir)
+            _queue_menu_images(cached, out_dir, client, cache_dir, img_tasks)
+            recipes.extend(cached)
+            continue
+        custom_id = png_path.stem
+        pending[custom_id] = png_path
+        lines.append(_json_dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": _parse_request_body(_page_b64(png_path)),
+        }))
+
+    if pending:
+        batch_input = await _with_retries(lambda: client.files.create(
+            file=("recipe_pages.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        ))
+        batch = await _with_retries(lambda: client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        ))
+        print(f"Submitted batch {batch.id} with {len(pending)} page(s).")
+
+        delay = poll_interval
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 600)
+            batch = await _with_retries(
+                lambda: client.batches.retrieve(batch.id))
+            print(f"Batch {batch.id}: {batch.status}")
+
+        if batch.status != "completed":
+            print(f"Batch {batch.id} ended as {batch.status}; aborting.")
+        else:
+            output = await _with_retries(
+                lambda: client.files.content(batch.output_file_id))
+            for line in output.text.splitlines():
+                result = _json_loads(line)
+                png_path = pending.get(result.get("custom_id"))
+                if png_path is None:
+                    continue
+                error = result.get("error") or result["response"]["status_code"] != 200
+                if error:
+                    print(f"[{png_path}] – batch request failed: {error}")
+                    continue
+                raw_text = _content_to_raw_text(
+                    _batch_output_text(result["response"]["body"]).strip())
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                cache_file = cache_dir / f"{_png_fingerprint(png_path)}.txt"
+                cache_file.write_text(raw_text, encoding="utf-8")
+                parsed = _emit_recipes(raw_text, png_path, out_dir)
+                _queue_menu_images(parsed, out_dir, client, cache_dir, img_tasks)
+                recipes.extend(parsed)
+
+    if img_tasks:
+        await asyncio.gather(*img_tasks)
+
+    return recipes
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -257,13 +886,30 @@ def main() -> None:
         "--api-key",
         help="OpenAI API key (falls back to OPENAI_API_KEY env var)",
     )
+    parser.add_argument(
+        "--detail",
+        choices=("auto", "low", "high"),
+        default="auto",
+        help="Vision detail level; 'auto' runs a cheap low-detail "
+             "pre-classifier and only escalates pages that have a recipe",
+    )
 
     args = parser.parse_args()
     api_key = args.api_key or os.getenv("OPENAI_API_KEY")
     if not api_key:
         parser.error("You must provide --api-key or set OPENAI_API_KEY in the environment.")
 
-    process_recipe_image(args.png, args.out_dir, api_key)
+    # one client (and one HTTPS connection pool) for every call in this run
+    client = get_client(api_key)
+
+    async def run() -> None:
+        try:
+            await process_recipe_image(args.png, args.out_dir, client,
+                                       detail=args.detail)
+        finally:
+            await close_http_session()
+
+    asyncio.run(run())
 
 
 if __name__ == "__main__":